@@ -0,0 +1,190 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "numpy",
+# ]
+# ///
+
+import argparse
+import json
+import math
+import sqlite3
+import time
+from collections import Counter
+
+import numpy as np
+
+from workload import gem_weights
+
+# Rows fetched from the cursor at a time (bounds the memory used by the scan itself)
+BATCH_SIZE = 10_000
+
+# Each table is streamed once, in storage order (no JOIN / ORDER BY, so no indexes nor temp storage required):
+# - reconciliation notes are skipped: the generators insert those themselves
+# - outbound notes have NULL warehouse_id
+NOTES_QUERY = """
+SELECT id, warehouse_id, updated_at
+FROM note
+WHERE COALESCE(is_reconciliation_note, 0) = 0
+"""
+TXNS_QUERY = """
+SELECT note_id, isbn, quantity
+FROM book_transaction
+"""
+
+
+def fit_gem_alpha(counts: list[int]) -> float:
+    """
+    Fit GEM concentration parameter (alpha) to the observed ISBN popularity shape: we match the probability
+    of two books (drawn from all transactions) having the same ISBN (Simpson index: sum(w^2)).
+    For (untruncated) GEM: E[sum(w^2)] = 1 / (1 + alpha). The generator, however, truncates the catalogue at the
+    observed catalogue size (spreading the remaining weight across the catalogue), so we estimate E[sum(w^2)] of the
+    truncated process across a number of drawn catalogues. The same uniform draws are reused for every alpha (see `gem_weights`),
+    so the estimate is a smooth (decreasing) function of alpha, and we solve using bisection (on log scale).
+    """
+    counts = np.array(counts, dtype=float)
+    n = counts.sum()
+    if n < 2:
+        raise ValueError("Error: can't fit GEM alpha with less than 2 books")
+    # Unbiased estimate of sum(w^2)
+    simpson = (counts * (counts - 1)).sum() / (n * (n - 1))
+
+    catalogue_size = len(counts)
+    # Keep the number of uniform draws bounded for large catalogues
+    n_samples = max(10, min(200, 5_000_000 // catalogue_size))
+    u = np.random.default_rng(0).uniform(size=(n_samples, catalogue_size))
+
+    def expected_simpson(alpha: float) -> float:
+        return np.mean([(gem_weights(alpha, catalogue_size, u=row, spread_remainder=True) ** 2).sum() for row in u])
+
+    lo, hi = 1e-3, 1e6
+    for _ in range(50):
+        alpha = math.sqrt(lo * hi)
+        if expected_simpson(alpha) > simpson:
+            lo = alpha
+        else:
+            hi = alpha
+    return math.sqrt(lo * hi)
+
+
+class Stats:
+    """
+    Statistics accumulated during the scan. Memory footprint is O(notes + ISBNs): per-note totals
+    are kept until both tables have been streamed, ISBN counts are bounded by the catalogue size.
+    """
+
+    def __init__(self):
+        self.n_inbound = 0
+        self.n_outbound = 0
+        self.n_books_inbound = 0
+        self.n_books_outbound = 0
+        self.max_n_books_inbound = 0
+        self.isbn_counts = Counter()
+        self.hourly = np.zeros(24, dtype=np.int64)
+        self.daily = np.zeros(7, dtype=np.int64)
+        self.first_ts = math.inf
+        self.last_ts = -math.inf
+
+    def add_note(self, inbound, updated_at, n_books):
+        # Empty notes are never drawn by the generators
+        if n_books == 0:
+            return
+
+        if inbound:
+            self.n_inbound += 1
+            self.n_books_inbound += n_books
+            self.max_n_books_inbound = max(self.max_n_books_inbound, n_books)
+        else:
+            self.n_outbound += 1
+            self.n_books_outbound += n_books
+
+        # Only epoch ms timestamps count towards arrival rates (skip NULLs and malformed values)
+        if isinstance(updated_at, int):
+            # 1970-01-01 was a Thursday: shift by 3 to get Monday = 0
+            day = updated_at // 86_400_000
+            self.daily[(day + 3) % 7] += 1
+            self.hourly[(updated_at // 3_600_000) % 24] += 1
+            self.first_ts = min(self.first_ts, updated_at)
+            self.last_ts = max(self.last_ts, updated_at)
+
+    def profile(self) -> dict:
+        if self.n_inbound == 0 or self.n_outbound == 0:
+            raise ValueError("Error: calibration requires both inbound and outbound notes")
+
+        n_notes = self.n_inbound + self.n_outbound
+        n_timestamped = int(self.daily.sum())
+        if n_timestamped == 0:
+            raise ValueError("Error: calibration requires notes with (epoch ms) updated_at timestamps")
+
+        n_days = max(1, (self.last_ts - self.first_ts) / 86_400_000)
+
+        return {
+            "p_inbound": self.n_inbound / n_notes,
+            # Notes drawn by the generator (reconciliation notes are inserted on top of these)
+            "notes_per_day": n_notes / n_days,
+            # Geometric MLE: p = 1 / mean
+            "n_book_prob_inbound": self.n_inbound / self.n_books_inbound,
+            "n_book_prob_outbound": self.n_outbound / self.n_books_outbound,
+            "max_n_books_inbound": self.max_n_books_inbound,
+            "catalogue_size": len(self.isbn_counts),
+            "gem_alpha": fit_gem_alpha(list(self.isbn_counts.values())),
+            # Shares of notes per hour of day (UTC) and per day of week (Monday first)
+            "hourly_weights": (self.hourly / n_timestamped).tolist(),
+            "daily_weights": (self.daily / n_timestamped).tolist(),
+        }
+
+
+def stream(conn: sqlite3.Connection, query: str):
+    cursor = conn.execute(query)
+    while rows := cursor.fetchmany(BATCH_SIZE):
+        yield from rows
+
+
+def scan(db_path: str) -> Stats:
+    stats = Stats()
+
+    # Read-only: we never want to touch the production DB
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+    # Note id -> [inbound, updated_at, n_books]
+    notes = {}
+    for note_id, warehouse_id, updated_at in stream(conn, NOTES_QUERY):
+        notes[note_id] = [warehouse_id is not None, updated_at, 0]
+
+    for note_id, isbn, quantity in stream(conn, TXNS_QUERY):
+        note = notes.get(note_id)
+        # Transactions of reconciliation notes (or missing notes)
+        if note is None:
+            continue
+        note[2] += quantity
+        stats.isbn_counts[isbn] += quantity
+
+    conn.close()
+
+    for inbound, updated_at, n_books in notes.values():
+        stats.add_note(inbound, updated_at, n_books)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calibrate generator parameters from a (production-shaped) librocco SQLite DB"
+    )
+    parser.add_argument("db_path", help="path to the SQLite DB to scan")
+    parser.add_argument(
+        "-o", "--output", default="profile.json", help="profile file to write (default: profile.json)"
+    )
+    args = parser.parse_args()
+
+    start = time.time()
+
+    profile = scan(args.db_path).profile()
+    with open(args.output, "w") as f:
+        json.dump(profile, f, indent=2)
+
+    print(f"took: {time.time() - start:.2f} seconds")
+    print(f"wrote profile to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,35 +9,17 @@
 import pandas as pd
 import numpy as np
 
+from workload import GEM_TRUNC_BETA, GEM_TRUNC_N, gem_weights, load_profile, warehouse_weights
+
 # NOTE: overriding 'int' to a chosen np.int type, we explicitly state it wherever applicable,
 # but can manage it here, at the top of the file
 int = np.int64
 
+# Optional profile and workload preset - override the defaults below
+profile = load_profile()
 
-def gem_weights(alpha: float, trunc_n=1_000, trunc_beta: float | None = None):
-    """
-    Draw a sample from the GEM (Griffiths, Engen, McCloskey) distribution.
-    This distribution is explained using stick breaking analogy, where for each element, we
-    break off a portion of the unit stick:
-        - first part is the probability mass assigned to the element
-        - the remaining part is used for subsequent elements
-    NOTE: the process (in methematical terms) goes into infinity, so (in practice) we truncate:
-        - after `trunc_n`: fixed result vector length (default 1000)
-        - after `trunc_beta`: truncates when the remaining weight is smaller than `trunc_beta`
-        - the last item gets the remaining weights (ensuring the vector sums to 1)
-    """
-
-    proportions = np.random.beta(1, alpha, size=trunc_n)
-    # betas (GEM conventional notation) = weights
-    betas = proportions * np.concatenate([[1], np.cumprod(1 - proportions[:-1])])
-
-    if trunc_beta is not None:
-        betas = betas[betas.cumsum() < (1 - trunc_beta)]
-
-    # Leave the remaining weight with the last bin (ensuring the weights sum to 1)
-    betas[-1] += 1 - betas[:-1].sum()
-    return betas
-
+# Empirically, using production data
+gem_alpha = profile.get("gem_alpha", 30)
 
 df_books = pd.read_csv("./data/books.csv")
 df_warehouses = pd.read_csv("./data/warehouses.csv")
@@ -49,8 +31,16 @@ n_warehouses = len(df_warehouses)
 
 # Draw a random book catalog (a subset of fool list of ISBNs)
 #
-# Draw weights -- this setup draws approx 160 non-zero probability masses
-weights = gem_weights(30, 300, 1 / 200)
+# Draw weights -- with the default alpha (30), this setup draws approx 160 non-zero probability masses
+# 'catalogue_size' (observed in production) replaces the default truncation: the catalogue has exactly that many
+# ISBNs (capped at the full list of ISBNs)
+if "catalogue_size" in profile:
+    weights = gem_weights(gem_alpha, min(profile["catalogue_size"], n_books), spread_remainder=True)
+else:
+    weights = gem_weights(gem_alpha, GEM_TRUNC_N, GEM_TRUNC_BETA)
+# 'flat_catalogue' replaces the GEM weights with the given number of equally popular ISBNs
+if "flat_catalogue" in profile:
+    weights = np.full(profile["flat_catalogue"], 1 / profile["flat_catalogue"])
 catalogue_size = len(weights)
 # Draw "atoms" from the full ISBN list -- assigning a particular weight (probability mass) to each
 catalogue_index = np.random.permutation(np.arange(n_books))[:catalogue_size]
@@ -88,9 +78,9 @@ warehouse_id = np.repeat(df_notes["warehouse_id"].to_numpy(int), N).reshape(
 # NOTE: we're doing this for non-zero quantities only (representing actual transaction quantity and not just an ISBN placeholder for a note)
 outbound_mask = (warehouse_id == 0) & (txn_matrix != 0)
 n_outbound_txns = len(warehouse_id[outbound_mask])
-# Randomise the index and sample from the list of warehouse ids
-warehouse_id[outbound_mask] = df_warehouses["id"][
-    np.random.randint(0, n_warehouses, size=n_outbound_txns, dtype=int)
+# Randomise the index (weighted according to the profile) and sample from the list of warehouse ids
+warehouse_id[outbound_mask] = df_warehouses["id"].to_numpy(int)[
+    np.random.choice(n_warehouses, size=n_outbound_txns, p=warehouse_weights(n_warehouses, profile))
 ]
 
 # Allocate a new txn_matrix, adding additional dimension for warehouses
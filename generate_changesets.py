@@ -0,0 +1,180 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "pandas",
+#   "numpy",
+# ]
+# ///
+
+import glob
+import os
+
+import pandas as pd
+import numpy as np
+
+OUTPUT_DIR = "./data/changesets"
+
+# Number of simulated devices (CRSQLite sites) writing to the same DB
+n_clients = int(os.getenv("N_CLIENTS", 4))
+
+
+def to_ms(col: pd.Series) -> pd.Series:
+    """
+    Normalise a timestamp column to epoch milliseconds (nullable int).
+    NOTE: reconciliation notes (and their transactions) carry datetime strings rather than
+    epoch milliseconds, so we need to handle both representations.
+    """
+    ms = pd.to_numeric(col, errors="coerce")
+    dt_mask = ms.isna() & col.notna()
+    ms[dt_mask] = (pd.to_datetime(col[dt_mask]) - pd.Timestamp("1970-01-01")) // pd.Timedelta("1ms")
+    return ms.round().astype("Int64")
+
+
+def to_changes(df: pd.DataFrame, table: str, cols: list[str], col_version: int) -> pd.DataFrame:
+    """
+    Explode each row of `df` into per-column changes (a single row in crsql_changes represents a single column value).
+    `df` is expected to contain "client", "note_id", "ts", "event" and "pk" columns (used for ordering and grouping).
+    """
+    changes = df.melt(
+        id_vars=["client", "note_id", "ts", "event", "pk"],
+        value_vars=cols,
+        var_name="cid",
+        value_name="val",
+    )
+    changes["table"] = table
+    changes["col_version"] = col_version
+    return changes
+
+
+df_notes = pd.read_csv("./data/notes.csv")
+df_txns = pd.read_csv("./data/book_transactions.csv", dtype={"isbn": str})
+
+df_notes["updated_at"] = to_ms(df_notes["updated_at"])
+df_notes["committed_at"] = to_ms(df_notes["committed_at"])
+df_txns["updated_at"] = to_ms(df_txns["updated_at"])
+df_txns["committed_at"] = to_ms(df_txns["committed_at"])
+# NOTE: Make sure warehouse 0 = NULL (outbound notes) - same as in the DB
+df_notes["warehouse_id"] = df_notes["warehouse_id"].astype("Int64")
+df_notes.loc[df_notes["warehouse_id"] == 0, "warehouse_id"] = pd.NA
+
+# Each note is created (and committed) on a single, randomly assigned, device.
+# Transactions are written by the same device as their parent note.
+df_notes["client"] = np.random.randint(0, n_clients, size=len(df_notes))
+df_txns["client"] = df_notes.set_index("id")["client"][df_txns["note_id"]].to_numpy()
+
+site_ids = np.array([np.random.bytes(16).hex() for _ in range(n_clients)])
+
+# Primary keys are written as JSON arrays - the replay client is responsible for packing them
+# the way CRSQLite expects (as the pk blob)
+df_notes["note_id"] = df_notes["id"]
+df_notes["pk"] = "[" + df_notes["id"].astype(str) + "]"
+df_txns["pk"] = (
+    '["'
+    + df_txns["isbn"]
+    + '",'
+    + df_txns["note_id"].astype(str)
+    + ","
+    + df_txns["warehouse_id"].astype(str)
+    + "]"
+)
+
+# Each note produces (up to) two DB transactions on its device:
+# - event 0 (at updated_at): insert the note and its book transactions, uncommitted
+# - event 1 (at committed_at): commit the note (only for committed notes)
+note_inserts = df_notes.assign(ts=df_notes["updated_at"], event=0, committed=0, committed_at=pd.NA)
+txn_inserts = df_txns.assign(ts=df_txns["updated_at"], event=0, committed_at=pd.NA)
+
+committed_notes = df_notes[df_notes["committed"] == 1]
+note_commits = committed_notes.assign(ts=committed_notes["committed_at"], event=1)
+committed_txns = df_txns[df_txns["committed_at"].notna()]
+txn_commits = committed_txns.assign(ts=committed_txns["committed_at"], event=1)
+
+# note (
+# 	id INTEGER NOT NULL,
+# 	display_name TEXT,
+# 	warehouse_id INTEGER,
+# 	is_reconciliation_note INTEGER DEFAULT 0,
+# 	default_warehouse INTEGER,
+# 	updated_at INTEGER DEFAULT (strftime('%s', 'now') * 1000),
+# 	committed INTEGER NOT NULL DEFAULT 0,
+# 	committed_at INTEGER,
+# 	PRIMARY KEY (id)
+# );
+#
+# book_transaction (
+# 	isbn TEXT NOT NULL,
+# 	quantity INTEGER NOT NULL DEFAULT 0,
+# 	note_id INTEGER NOT NULL,
+# 	warehouse_id INTEGER NOT NULL DEFAULT 0,
+# 	updated_at INTEGER NOT NULL DEFAULT (strftime('%s', 'now') * 1000),
+# 	committed_at INTEGER,
+# 	PRIMARY KEY (isbn, note_id, warehouse_id)
+# );
+#
+# NOTE: the order of the frames is important: within the same DB transaction, the note
+# is written before its book transactions
+df_changes = pd.concat([
+    to_changes(
+        note_inserts,
+        "note",
+        [
+            "display_name",
+            "warehouse_id",
+            "is_reconciliation_note",
+            "default_warehouse",
+            "updated_at",
+            "committed",
+            "committed_at",
+        ],
+        col_version=1,
+    ),
+    to_changes(txn_inserts, "book_transaction", ["quantity", "updated_at", "committed_at"], col_version=1),
+    to_changes(note_commits, "note", ["committed", "committed_at"], col_version=2),
+    to_changes(txn_commits, "book_transaction", ["committed_at"], col_version=2),
+])
+
+# Order each device's changes by time - a stable sort keeps the (note -> book_transaction) order within a DB transaction
+df_changes = df_changes.sort_values(["client", "ts", "note_id", "event"], kind="stable").reset_index(drop=True)
+
+# A new DB transaction (db_version) starts whenever the (note, event) pair changes within a device's stream
+tx_start = (
+    df_changes[["client", "note_id", "event"]].ne(df_changes[["client", "note_id", "event"]].shift()).any(axis=1)
+)
+df_changes["db_version"] = tx_start.astype(int).groupby(df_changes["client"]).cumsum()
+df_changes["seq"] = df_changes.groupby(["client", "db_version"]).cumcount()
+df_changes["site_id"] = site_ids[df_changes["client"]]
+# Rows are never deleted, so causal length is always 1
+df_changes["cl"] = 1
+
+# crsql_changes (
+# 	[table] TEXT NOT NULL,
+# 	[pk] BLOB NOT NULL,
+# 	[cid] TEXT NOT NULL,
+# 	[val] ANY,
+# 	[col_version] INTEGER NOT NULL,
+# 	[db_version] INTEGER NOT NULL,
+# 	[site_id] BLOB NOT NULL,
+# 	[cl] INTEGER NOT NULL,
+# 	[seq] INTEGER NOT NULL
+# );
+#
+# Additionally, we keep the "ts" (epoch ms) column - used to interleave the streams across devices when replaying
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Remove streams left over from a previous run (with a different number of clients)
+for path in glob.glob(f"{OUTPUT_DIR}/client_*.csv"):
+    os.remove(path)
+for client, df_client in df_changes.groupby("client"):
+    df_client[
+        [
+            "ts",
+            "table",
+            "pk",
+            "cid",
+            "val",
+            "col_version",
+            "db_version",
+            "site_id",
+            "cl",
+            "seq",
+        ]
+    ].to_csv(f"{OUTPUT_DIR}/client_{client}.csv", index=False)
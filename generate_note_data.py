@@ -9,6 +9,11 @@
 import pandas as pd
 import numpy as np
 
+from workload import load_profile, warehouse_weights
+
+# Optional profile and workload preset - override the defaults below
+profile = load_profile()
+
 w_df = pd.read_csv("./data/warehouses.csv")
 n_warehouses = len(w_df)
 
@@ -23,14 +28,22 @@ n_warehouses = len(w_df)
 # 	committed_at INTEGER,
 # )
 
+# Our book store is open 24-7 ;)
+start_date = pd.Timestamp("2025-01-01").timestamp()
+end_date = pd.Timestamp("2025-08-31").timestamp()
+second_range = end_date - start_date
+
 # Empirically, using production data
-p_inbound = 1 / 3  # Probability of a note being inbound
+p_inbound = profile.get("p_inbound", 1 / 3)  # Probability of a note being inbound
 total_notes = 15_000
+if "notes_per_day" in profile:
+    # NOTE: we need at least one (initial inbound) note per warehouse
+    total_notes = max(n_warehouses, round(profile["notes_per_day"] * second_range / 86_400))
 
 # The empirical distributions resemble geometric distributions
-max_n_books_inbound = 300  # Empirical max = 271
-n_book_prob_inbound = 1 / 8  # Emprical mean = 8
-n_book_prob_outbound = 1 / 3  # Emprical mean = 3
+max_n_books_inbound = profile.get("max_n_books_inbound", 300)  # Empirical max = 271
+n_book_prob_inbound = profile.get("n_book_prob_inbound", 1 / 8)  # Emprical mean = 8
+n_book_prob_outbound = profile.get("n_book_prob_outbound", 1 / 3)  # Emprical mean = 3
 
 
 ids = np.arange(1, total_notes + 1)
@@ -40,13 +53,34 @@ inbound = np.random.binomial(1, p_inbound, total_notes)
 # Ensure we start with 1 inbound note per each warehouse
 inbound[:n_warehouses] = 1
 
-# Our book store is open 24-7 ;)
-start_date = pd.Timestamp("2025-01-01").timestamp()
-end_date = pd.Timestamp("2025-08-31").timestamp()
-second_range = end_date - start_date
-updated_at_sec = np.random.exponential(scale=1, size=total_notes).astype(int).cumsum()
-scaler = second_range / updated_at_sec[-1]
-updated_at_sec = np.round(updated_at_sec * scaler + start_date)
+if profile.get("arrivals") == "bursty":
+    # Bursts of notes arriving in quick succession, separated by (regular) exponential gaps:
+    # - each gap ends the current burst with probability 'p_burst_end' (mean burst size = 1 / p_burst_end)
+    # - gaps within a burst are 100x shorter
+    p_burst_end = profile.get("p_burst_end", 1 / 20)
+    gap_scale = np.where(np.random.binomial(1, p_burst_end, total_notes) == 1, 1, 0.01)
+    updated_at_sec = np.random.exponential(scale=gap_scale).cumsum()
+    scaler = second_range / updated_at_sec[-1]
+    updated_at_sec = np.round(updated_at_sec * scaler + start_date)
+elif "hourly_weights" in profile and "daily_weights" in profile:
+    # Draw arrivals following the profile's hourly/daily rates:
+    # - draw a day (weighted by the share of notes for its day of week)
+    # - draw an hour (weighted by the share of notes for the hour of day)
+    # - spread uniformly within the hour
+    days = pd.date_range("2025-01-01", "2025-08-30")
+    day_weights = np.array(profile["daily_weights"])[days.dayofweek]
+    day_ix = np.random.choice(len(days), size=total_notes, p=day_weights / day_weights.sum())
+    hour = np.random.choice(24, size=total_notes, p=profile["hourly_weights"])
+    updated_at_sec = (
+        days[day_ix].to_numpy("datetime64[s]").astype(np.int64)
+        + hour * 3600
+        + np.random.randint(0, 3600, size=total_notes)
+    )
+    updated_at_sec = np.sort(updated_at_sec)
+else:
+    updated_at_sec = np.random.exponential(scale=1, size=total_notes).astype(int).cumsum()
+    scaler = second_range / updated_at_sec[-1]
+    updated_at_sec = np.round(updated_at_sec * scaler + start_date)
 updated_at = pd.to_datetime(updated_at_sec, unit="s")
 
 df = pd.DataFrame({
@@ -74,8 +108,9 @@ df.loc[df["_inbound"] == 0, "display_name"] = (
     "Sale (" + np.arange(1, n_outbound + 1).astype(str) + ")"
 )
 
-df.loc[df["_inbound"] == 1, "warehouse_id"] = np.random.randint(
-    1, n_warehouses + 1, size=n_inbound
+# (Non-initial) inbound notes are assigned to warehouses according to the profile's warehouse weights
+df.loc[df["_inbound"] == 1, "warehouse_id"] = np.random.choice(
+    np.arange(1, n_warehouses + 1), size=n_inbound, p=warehouse_weights(n_warehouses, profile)
 )
 # Make sure we start with 1 inbound note per each warehouse
 df.loc[: n_warehouses - 1, "warehouse_id"] = np.arange(1, n_warehouses + 1)
@@ -0,0 +1,89 @@
+"""
+Workload parameters shared by the generators: calibration profile / preset loading and
+weights derived from them.
+"""
+
+import json
+import os
+
+import numpy as np
+
+# Truncation of the GEM distribution used to draw the book catalogue (see `gem_weights`)
+GEM_TRUNC_N = 300
+GEM_TRUNC_BETA = 1 / 200
+
+
+def load_profile() -> dict:
+    """
+    Load the optional profile (see calibrate_profile.py, selected with PROFILE=<path>) and
+    workload preset (see presets/, selected with PRESET=<name>).
+    NOTE: preset values take precedence, so a preset can be applied on top of a calibrated profile
+    """
+    profile = {}
+
+    path = os.getenv("PROFILE")
+    if path:
+        with open(path) as f:
+            profile.update(json.load(f))
+
+    preset = os.getenv("PRESET")
+    if preset:
+        with open(f"./presets/{preset}.json") as f:
+            profile.update(json.load(f))
+
+    return profile
+
+
+def warehouse_weights(n_warehouses: int, profile: dict):
+    """
+    Probability of assigning a particular warehouse (to an inbound note or an outbound txn):
+        - uniform by default
+        - 'dominant_warehouse_share' assigns the given share to the first warehouse (the rest is split uniformly)
+    """
+    weights = np.full(n_warehouses, 1 / n_warehouses)
+    if "dominant_warehouse_share" in profile:
+        share = profile["dominant_warehouse_share"]
+        if not 0 <= share <= 1:
+            raise ValueError(f"Error: dominant_warehouse_share must be between 0 and 1, got: {share}")
+        # A single warehouse gets everything regardless of the share
+        if n_warehouses == 1:
+            return weights
+        weights[:] = (1 - share) / (n_warehouses - 1)
+        weights[0] = share
+    return weights
+
+
+def gem_weights(alpha: float, trunc_n=1_000, trunc_beta: float | None = None, u=None, spread_remainder=False):
+    """
+    Draw a sample from the GEM (Griffiths, Engen, McCloskey) distribution.
+    This distribution is explained using stick breaking analogy, where for each element, we
+    break off a portion of the unit stick:
+        - first part is the probability mass assigned to the element
+        - the remaining part is used for subsequent elements
+    NOTE: the process (in methematical terms) goes into infinity, so (in practice) we truncate:
+        - after `trunc_n`: fixed result vector length (default 1000)
+        - after `trunc_beta`: truncates when the remaining weight is smaller than `trunc_beta`
+        - the last item gets the remaining weights (ensuring the vector sums to 1)
+    If `u` (uniform draws, size `trunc_n`) is provided, the proportions are derived from it using the
+    inverse CDF of Beta(1, alpha) - this way the same draw can be evaluated for different alphas.
+    If `spread_remainder` is set, the remaining weight is spread proportionally across all items instead - when truncating
+    at a fixed catalogue size (with large alpha), the remainder would otherwise make the last item the most popular one.
+    """
+
+    if u is None:
+        proportions = np.random.beta(1, alpha, size=trunc_n)
+    else:
+        proportions = 1 - (1 - u) ** (1 / alpha)
+    # betas (GEM conventional notation) = weights
+    betas = proportions * np.concatenate([[1], np.cumprod(1 - proportions[:-1])])
+
+    if trunc_beta is not None:
+        # NOTE: keeping at least one element (for small alphas, the first stick alone might cross the threshold)
+        betas = betas[: max(1, (betas.cumsum() < (1 - trunc_beta)).sum())]
+
+    if spread_remainder:
+        return betas / betas.sum()
+
+    # Leave the remaining weight with the last bin (ensuring the weights sum to 1)
+    betas[-1] += 1 - betas[:-1].sum()
+    return betas